@@ -1,40 +1,18 @@
+from pathlib import Path
+
 import streamlit as st
-import networkx as nx
+
+from cpm_core import build_graph, critical_path, render_dot
 
 st.set_page_config(page_title="INE Course Map", layout="wide")
 
-st.markdown("""
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Quicksand:wght@400;600&display=swap');
-
-    html, body, [class*="css"] {
-        font-family: 'Quicksand', sans-serif;
-    }
-
-    .stApp {
-        background: linear-gradient(-45deg, #ee7752, #e73c7e, #23a6d5, #23d5ab);
-        background-size: 400% 400%;
-        animation: gradient 15s ease infinite;
-    }
-
-    @keyframes gradient {
-        0% { background-position: 0% 50%; }
-        50% { background-position: 100% 50%; }
-        100% { background-position: 0% 50%; }
-    }
-
-    .stMetric, .stMarkdown, .stInfo, .stSuccess, .stError, .stWarning {
-        background-color: rgba(255, 255, 255, 0.85);
-        padding: 15px;
-        border-radius: 15px;
-        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-    }
-
-    section[data-testid="stSidebar"] {
-        background-color: rgba(255, 255, 255, 0.9);
-    }
-</style>
-""", unsafe_allow_html=True)
+# The stylesheet is read from disk once per process, not on every rerun.
+@st.cache_resource
+def _css():
+    css = (Path(__file__).parent / "static" / "theme.css").read_text(encoding="utf-8")
+    return f"<style>{css}</style>"
+
+st.markdown(_css(), unsafe_allow_html=True)
 
 # --- PART 1: THE DATA (Extracted from your PDF) ---
 # I have mapped the prerequisites based on standard flows and the PDF arrows.
@@ -80,27 +58,43 @@ curriculum = {
 }
 
 # --- PART 2: THE LOGIC (Critical Path Engine) ---
+# Critical Path = Soft Red/Pink, Others = Soft Blue/White
+PALETTE = {
+    "critical_node": "#ffadad", # Pastel Red
+    "critical_font": "black",
+    "node": "#e0f7fa", # Pastel Blue
+    "font": "#555",
+    "critical_edge": "#ff6b6b", # Darker red for critical arrows
+    "edge": "#b0bec5", # Grey for others
+}
+
+# The curriculum never changes, so the graph is built once per process.
+@st.cache_resource
+def _base_graph():
+    return build_graph(curriculum)
+
+BASE_G = _base_graph()
+
+# Pure function of the passed set, so reruns with the same selection are cache hits.
+# Returns plain lists because st.cache_data pickles its results.
+@st.cache_data(max_entries=256)
+def _cpm(passed_key: frozenset):
+    return critical_path(BASE_G, passed_key)
+
 def calculate_critical_path(passed_courses):
-    G = nx.DiGraph()
-    for course, prereqs in curriculum.items():
-        G.add_node(course)
-        for p in prereqs:
-            G.add_edge(p, course)
-
-    remaining_graph = G.copy()
-    for course in passed_courses:
-        if course in remaining_graph:
-            remaining_graph.remove_node(course)
-
-    try:
-        if len(remaining_graph.nodes) == 0:
-            return 0, [], remaining_graph
-        critical_path = nx.dag_longest_path(remaining_graph)
-        semesters_needed = len(critical_path)
-    except nx.NetworkXError:
-        return 0, [], remaining_graph
-
-    return semesters_needed, critical_path, remaining_graph
+    return _cpm(frozenset(passed_courses))
+
+# Students usually tick courses in the order they took them (Year 1 -> Year 4),
+# so every prefix of the curriculum order is computed once per process up front.
+@st.cache_resource
+def _warm_cpm_cache():
+    passed = []
+    for course in curriculum:
+        _cpm(frozenset(passed))
+        passed.append(course)
+    _cpm(frozenset(passed))
+
+_warm_cpm_cache()
 
 # --- PART 3: THE UI ---
 st.title("🎓 INE Flow Optimizer")
@@ -112,7 +106,7 @@ all_courses = list(curriculum.keys())
 passed_selection = st.sidebar.multiselect("Select courses you passed:", options=all_courses)
 
 if st.button("Calculate Path", type="primary"):
-    semesters, path, graph = calculate_critical_path(passed_selection)
+    semesters, path, nodes, edges = calculate_critical_path(passed_selection)
 
     if semesters == 0:
         st.balloons()
@@ -121,8 +115,8 @@ if st.button("Calculate Path", type="primary"):
         # Dashboard Layout
         c1, c2, c3 = st.columns(3)
         c1.metric("Semesters Left (Min)", semesters)
-        c2.metric("Remaining Courses", len(graph.nodes))
-        c3.metric("Critical Bottleneck", path[0].split("-")[0]) # Shows just code (e.g., INE 331)
+        c2.metric("Remaining Courses", len(nodes))
+        c3.metric("Critical Bottleneck", BASE_G.labels[path[0]]) # Shows just code (e.g., INE 331)
 
         st.markdown("### 🚦 The Critical Path")
         st.caption("You cannot drop these courses without delaying graduation.")
@@ -135,29 +129,7 @@ if st.button("Calculate Path", type="primary"):
         st.markdown("### 🕸️ Visual Map")
         try:
             # Customizing the graph look to match the "Chill" theme
-            dot_code = 'digraph G { rankdir="LR"; bgcolor="transparent"; node [style="filled", shape="box", fontname="Quicksand", penwidth="0"]; edge [penwidth="2"]; '
-            
-            for node in graph.nodes():
-                # Critical Path = Soft Red/Pink, Others = Soft Blue/White
-                if node in path:
-                    color = "#ffadad" # Pastel Red
-                    font = "black"
-                else:
-                    color = "#e0f7fa" # Pastel Blue
-                    font = "#555"
-                
-                # Cleanup names for the graph (too long names break the visual)
-                short_name = node.split("-")[0] 
-                dot_code += f'"{node}" [label="{short_name}", fillcolor="{color}", fontcolor="{font}"]; '
-            
-            for u, v in graph.edges():
-                if u in path and v in path:
-                    color = "#ff6b6b" # Darker red for critical arrows
-                else:
-                    color = "#b0bec5" # Grey for others
-                dot_code += f'"{u}" -> "{v}" [color="{color}"]; '
-            
-            dot_code += "}"
+            dot_code = render_dot(BASE_G, nodes, edges, path, PALETTE)
             st.graphviz_chart(dot_code)
             
         except Exception:
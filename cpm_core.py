@@ -0,0 +1,129 @@
+from collections import deque
+from types import MappingProxyType
+from typing import Mapping, NamedTuple
+
+# Shared Critical Path Engine. Pages supply their own curriculum and palette.
+
+DOT_HEADER = 'digraph G { rankdir="LR"; bgcolor="transparent"; node [style="filled", shape="box", fontname="Quicksand", penwidth="0"]; edge [penwidth="2"]; '
+
+# Read-only throughout: one instance is shared by every session in the process.
+class CourseGraph(NamedTuple):
+    courses: tuple
+    succ: Mapping
+    pred: Mapping
+    topo: tuple
+    labels: Mapping
+    idx: Mapping
+    pred_mask: tuple
+
+def _topo_order(pred, succ):
+    # Kahn's algorithm
+    indegree = {v: len(ps) for v, ps in pred.items()}
+    queue = deque(v for v, d in indegree.items() if d == 0)
+    order = []
+    while queue:
+        u = queue.popleft()
+        order.append(u)
+        for v in succ[u]:
+            indegree[v] -= 1
+            if indegree[v] == 0:
+                queue.append(v)
+    if len(order) != len(pred):
+        raise ValueError("curriculum has a prerequisite cycle")
+    return order
+
+def build_graph(curriculum):
+    succ = {c: [] for c in curriculum}
+    pred = {c: list(p) for c, p in curriculum.items()}
+    for c, ps in curriculum.items():
+        for p in ps:
+            succ[p].append(c)
+    # Cleanup names for the graph (too long names break the visual)
+    labels = {c: c.split("-")[0] for c in curriculum}
+    # Course i in topo order owns bit i of every mask
+    topo = _topo_order(pred, succ)
+    idx = {c: i for i, c in enumerate(topo)}
+    pred_mask = [sum(1 << idx[p] for p in pred[v]) for v in topo]
+    return CourseGraph(
+        tuple(curriculum),
+        MappingProxyType({c: tuple(vs) for c, vs in succ.items()}),
+        MappingProxyType({c: tuple(ps) for c, ps in pred.items()}),
+        tuple(topo),
+        MappingProxyType(labels),
+        MappingProxyType(idx),
+        tuple(pred_mask),
+    )
+
+def passed_mask(base_g, passed):
+    idx = base_g.idx
+    return sum(1 << idx[c] for c in set(passed) if c in idx)
+
+def critical_path(base_g, passed):
+    topo, idx = base_g.topo, base_g.idx
+    remaining = ~passed_mask(base_g, passed)
+    nodes = [n for n in base_g.courses if remaining >> idx[n] & 1]
+    edges = [(u, v) for u in nodes for v in base_g.succ[u] if remaining >> idx[v] & 1]
+
+    # Longest path DP over the cached topological order
+    dist = [0] * len(topo)
+    parent = [-1] * len(topo)
+    pred_mask = base_g.pred_mask
+    best_dist = 0
+    best_end = -1
+    for i in range(len(topo)):
+        if not remaining >> i & 1:
+            continue
+        best = 0
+        bp = -1
+        # Walk the remaining prerequisites one set bit at a time
+        m = pred_mask[i] & remaining
+        while m:
+            low = m & -m
+            j = low.bit_length() - 1
+            if dist[j] > best:
+                best = dist[j]
+                bp = j
+            m ^= low
+        dist[i] = best + 1
+        parent[i] = bp
+        if dist[i] > best_dist:
+            best_dist = dist[i]
+            best_end = i
+
+    if best_end == -1:
+        return 0, [], nodes, edges
+
+    end = best_end
+    path = []
+    while end != -1:
+        path.append(topo[end])
+        end = parent[end]
+    path.reverse()
+
+    return len(path), path, nodes, edges
+
+def render_dot(base_g, nodes, edges, path, palette):
+    path_set = set(path)
+    path_edges = set(zip(path, path[1:]))
+
+    labels = base_g.labels
+    parts = [DOT_HEADER]
+
+    for node in nodes:
+        if node in path_set:
+            color = palette["critical_node"]
+            font = palette["critical_font"]
+        else:
+            color = palette["node"]
+            font = palette["font"]
+        parts.append(f'"{node}" [label="{labels[node]}", fillcolor="{color}", fontcolor="{font}"]; ')
+
+    for u, v in edges:
+        if (u, v) in path_edges:
+            color = palette["critical_edge"]
+        else:
+            color = palette["edge"]
+        parts.append(f'"{u}" -> "{v}" [color="{color}"]; ')
+
+    parts.append("}")
+    return "".join(parts)